@@ -1,57 +1,460 @@
 #!/usr/bin/env python3
-# Collatz Threaded Matrix Rain — start-at-top, spawn-next-after-5, top-culling, non-spam columns
+# Collatz Threaded Matrix Rain — start-at-top, spawn-next-after-5, bottom-culling, non-spam columns
 
-import sys, argparse, random, pygame
+from __future__ import annotations
+
+import sys, argparse, heapq, queue, random, threading, pygame
+from collections import deque
+from itertools import islice
+from typing import Any, Callable
+
+# Flags rather than rebinding the module names to None, so the file stays type-checkable
+try:
+    import numpy as np  # type: ignore[import-not-found]
+    from collatz_jit import collatz_u64  # imports numba
+    HAVE_NUMBA = True
+except ImportError:  # optional JIT for the 64-bit part of a trajectory
+    HAVE_NUMBA = False
+
+try:
+    import gmpy2  # type: ignore[import-untyped, import-not-found]
+    HAVE_GMPY2 = True
+except ImportError:  # optional GMP-backed bigints for long seeds
+    HAVE_GMPY2 = False
+
+# Integer type for seeds; mpz supports the same &, >>, * and str() the stepping code uses
+big_int: Callable[[int], Any] = gmpy2.mpz if HAVE_GMPY2 else int
+
+# Collatz values: int, or gmpy2.mpz for seeds. Not annotated as int, since a mypyc build
+# checks int annotations at runtime and would reject an mpz.
+BigInt = Any
+
+def decimal_digits(n: BigInt) -> str:
+    # GMP's subquadratic base conversion when available, CPython's str() otherwise
+    return gmpy2.digits(n, 10) if HAVE_GMPY2 else str(n)
+
+# Maps ASCII '0'..'9' to the byte values 0..9, which index the glyph cache directly
+DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+def stream_digits(n: BigInt) -> bytes:
+    # Render-only digits of n, one 0..9 value per byte
+    return decimal_digits(n).encode("ascii").translate(DIGIT_VALUES)
 
 # ---------- Collatz (strict integer math) ----------
-def collatz_step(n: int) -> int:
-    # Even -> n/2, Odd -> 3n+1, exact on Python ints
-    return n // 2 if n % 2 == 0 else 3 * n + 1  # [web:9]
+def collatz_step(n: BigInt) -> BigInt:
+    # Even -> n/2, Odd -> 3n+1, exact on Python ints (bit ops skip the generic modulo path)
+    return 3 * n + 1 if n & 1 else n >> 1  # [web:9]
+
+def collatz_plateau_step(n: BigInt) -> BigInt:
+    # Odd -> 3n+1 as usual, but an even value drops all its trailing zeros in one shift
+    if n & 1:
+        return 3 * n + 1
+    return n >> ((n & -n).bit_length() - 1)
+
+def collatz_shortcut_step(n: BigInt) -> BigInt:
+    # Terras shortcut: 3n+1 is always even for odd n, so halve it in the same step
+    # (each odd step stands for two classic steps)
+    return (3 * n + 1) >> 1 if n & 1 else n >> 1
+
+def collatz_odd_step(n: BigInt) -> BigInt:
+    # Odd-to-odd shortcut: apply 3n+1 to odd n, then strip every trailing zero in one shift
+    if n & 1:
+        n = 3 * n + 1
+    return n >> ((n & -n).bit_length() - 1)
+
+STEP_RULES = {"classic": collatz_step, "shortcut": collatz_shortcut_step,
+              "plateau": collatz_plateau_step, "odd": collatz_odd_step}
+
+# Largest odd n whose 3n+1 still fits in uint64
+U64_STEP_LIMIT = (2 ** 64 - 2) // 3
+
+# Memoized classic trajectories for small values: n -> every value after n down to the first 1.
+# Only values below the limit are keys (small tails are where lineages keep meeting), and the
+# whole table is dropped when full rather than tracking recency.
+TAIL_CACHE_LIMIT = 1 << 20
+TAIL_CACHE_MAX_ENTRIES = 1 << 12
+_tail_cache: dict[BigInt, tuple[BigInt, ...]] = {}
+
+def collatz_tail(n: BigInt) -> tuple[BigInt, ...]:
+    tail = _tail_cache.get(n)
+    if tail is not None:
+        return tail
+    path = []
+    m = n
+    while True:
+        m = collatz_step(m)
+        path.append(m)
+        if m == 1:
+            rest: tuple[BigInt, ...] = ()
+            break
+        cached = _tail_cache.get(m)
+        if cached is not None:
+            rest = cached
+            break
+    tail = tuple(path) + rest
+    if len(_tail_cache) >= TAIL_CACHE_MAX_ENTRIES:
+        _tail_cache.clear()
+    _tail_cache[n] = tail
+    return tail
+
+def collatz_sequence(n: BigInt, count: int, step=collatz_step, u64_buf=None) -> list[BigInt]:
+    # At least the next `count` values after n. For classic steps, values below
+    # TAIL_CACHE_LIMIT splice in a memoized tail first (which may overshoot `count`), then the
+    # JIT kernel takes whatever still fits in 64 bits, and plain Python steps take the rest.
+    # u64_buf, if given, is a reusable uint64 array of at least `count` slots for the kernel.
+    out: list[BigInt] = []
+    classic = step is collatz_step
+    while len(out) < count:
+        if classic and n < TAIL_CACHE_LIMIT:
+            out.extend(collatz_tail(n))
+        elif classic and HAVE_NUMBA and n <= U64_STEP_LIMIT:
+            need = count - len(out)
+            buf = u64_buf[:need] if u64_buf is not None else np.empty(need, np.uint64)
+            filled = collatz_u64(np.uint64(int(n)), np.uint64(U64_STEP_LIMIT), buf)
+            out.extend(buf[:filled].tolist())   # filled >= 1: n itself is in range
+        else:
+            out.append(step(n))
+        n = out[-1]
+    return out
+
+# ---------- Collatz values stepped ahead in batches ----------
+class BatchRefill:
+    """
+    - Refill plumbing shared by CollatzChain and CollatzHistory: step rule, batch size, kernel
+      scratch buffer, and the lock that extend() holds while computing a batch.
+    - request_refill() hands the object to the background producer's queue, at most once until
+      its next extend(); without a queue, batches are only computed inline.
+    """
+    __slots__ = ("step", "batch", "u64_buf", "lock", "refill_q", "refill_queued")
+
+    def __init__(self, step=collatz_step, batch: int = 64, refill_q: queue.Queue | None = None):
+        self.step = step
+        self.batch = max(1, batch)
+        # Kernel scratch, reused for every batch of this object (extend() holds the lock)
+        self.u64_buf = np.empty(self.batch, np.uint64) if HAVE_NUMBA else None
+        self.lock = threading.Lock()    # serializes extend() between producer and render thread
+        self.refill_q = refill_q
+        self.refill_queued = False
+
+    def request_refill(self):
+        if self.refill_q is not None and not self.refill_queued:
+            self.refill_queued = True
+            self.refill_q.put(self)
+
+# One Collatz lineage
+class CollatzChain(BatchRefill):
+    """
+    - Values are computed a batch ahead into `pending` as (value, stream_digits(value)) pairs,
+      so the decimal conversion happens wherever the batch is computed; spawns just pop one.
+    - With a refill queue, the chain asks a background producer for the next batch once half
+      of `pending` is used, and only computes inline if the producer has fallen behind.
+    """
+    __slots__ = ("tail", "pending")
+
+    def __init__(self, value: BigInt, step=collatz_step, batch: int = 64,
+                 refill_q: queue.Queue | None = None):
+        super().__init__(step, batch, refill_q)
+        self.tail = value               # last value already computed
+        self.pending: deque[tuple[BigInt, bytes]] = deque()
+        self.request_refill()
+
+    def extend(self):
+        with self.lock:
+            values = collatz_sequence(self.tail, self.batch, self.step, self.u64_buf)
+            self.tail = values[-1]
+            self.pending.extend((v, stream_digits(v)) for v in values)
+            self.refill_queued = False
+
+    def next_value(self) -> tuple[BigInt, bytes]:
+        try:
+            entry = self.pending.popleft()
+        except IndexError:
+            self.extend()               # producer behind (or none): compute on this thread
+            entry = self.pending.popleft()
+        if len(self.pending) < self.batch // 2:
+            self.request_refill()
+        return entry
+
+class CollatzHistory(BatchRefill):
+    """
+    - One memoized trajectory for lineages that all start from the same value (--start): each
+      lineage is a HistoryCursor into `values`, so the steps and decimal conversions run once
+      no matter how many lineages replay them.
+    - Once the trajectory reaches 1 the cycle through 1 is recorded and `period` set; cursors
+      then wrap back by the period, so the list stops growing.
+    """
+    __slots__ = ("values", "period")
+
+    def __init__(self, value: BigInt, step=collatz_step, batch: int = 64,
+                 refill_q: queue.Queue | None = None):
+        super().__init__(step, batch, refill_q)
+        # Appends come from the producer or a starved cursor, both under the lock
+        self.values: list[tuple[BigInt, bytes]] = [(value, stream_digits(value))]
+        self.period = 0
+        if value == 1:
+            self._close_cycle()
+        else:
+            self.request_refill()
+
+    def _close_cycle(self):
+        # Append step(1), step(step(1)), ... back to 1: values past the end repeat this run
+        n = self.values[-1][0]
+        period = 0
+        while True:
+            n = self.step(n)
+            self.values.append((n, stream_digits(n)))
+            period += 1
+            if n == 1:
+                break
+        self.period = period
+
+    def extend(self):
+        with self.lock:
+            if not self.period:
+                for v in collatz_sequence(self.values[-1][0], self.batch, self.step, self.u64_buf):
+                    self.values.append((v, stream_digits(v)))
+                    if v == 1:
+                        self._close_cycle()
+                        break
+            self.refill_queued = False
+
+class HistoryCursor:
+    # Lineage over a shared CollatzHistory; same next_value() contract as CollatzChain
+    __slots__ = ("history", "pos")
+
+    def __init__(self, history: CollatzHistory):
+        self.history = history
+        self.pos = 1                    # values[0] is the seed thread's own value
+
+    def next_value(self) -> tuple[BigInt, bytes]:
+        history = self.history
+        while self.pos >= len(history.values):
+            if history.period:
+                self.pos -= history.period
+            else:
+                history.extend()        # producer behind: compute on this thread
+        entry = history.values[self.pos]
+        self.pos += 1
+        if not history.period and len(history.values) - self.pos < history.batch // 2:
+            history.request_refill()
+        return entry
+
+# ---------- Pre-rendered digit glyphs, one per quantized brightness level ----------
+GLYPH_LEVELS = 16
+
+SDL_BLENDMODE_BLEND = 1
+
+def render_digit(font: pygame.font.Font, ch: str, level: int, head_rgb=(220, 255, 220),
+                 base_green=(0, 255, 65), solid: bool = False) -> pygame.Surface:
+    # Digit at a brightness level, colour and alpha both baked into its pixels, so it can be
+    # blitted any number of times with no per-surface alpha state; antialiased for clarity
+    m = level / (GLYPH_LEVELS - 1)
+    r = int(head_rgb[0] * m * 0.8)
+    g = int(base_green[1] * m)
+    b = int(base_green[2] * m * 0.5)
+    if solid:
+        # --fast-text: no antialiasing, alpha folded into the colour (same result over black),
+        # black background keyed out so blits take the colorkey path instead of per-pixel alpha
+        glyph = font.render(ch, False, (int(r * m), int(g * m), int(b * m)), (0, 0, 0))
+        glyph.set_colorkey((0, 0, 0))
+        return glyph
+    glyph = font.render(ch, True, (r, g, b))
+    glyph.fill((255, 255, 255, int(255 * m)), special_flags=pygame.BLEND_RGBA_MULT)
+    return glyph
+
+def build_glyph_cache(font: pygame.font.Font, solid: bool = False) -> list[list[pygame.Surface]]:
+    # Rasterize each digit once per level so draw() is blit-only (no render/set_alpha per frame);
+    # indexed as cache[digit][level]. Needs the display mode set so convert()/convert_alpha()
+    # can match it; solid glyphs have no alpha channel to keep.
+    if solid:
+        return [[render_digit(font, ch, level, solid=True).convert() for level in range(GLYPH_LEVELS)]
+                for ch in "0123456789"]
+    return [[render_digit(font, ch, level).convert_alpha() for level in range(GLYPH_LEVELS)]
+            for ch in "0123456789"]
+
+# ---------- Optional GPU backend: SDL2 renderer drawing from one glyph atlas texture ----------
+class GpuCanvas:
+    """
+    - All 10 digits x GLYPH_LEVELS levels (from render_digit) live in one atlas texture;
+      glyph_rects[digit][level] is each cell's source rect, used in place of cached surfaces.
+    - Frames are composed on a persistent target texture, since the trail fade needs last
+      frame's pixels and the window's back buffer is not preserved across present().
+    """
+    def __init__(self, size: tuple[int, int], title: str, font: pygame.font.Font, trail_alpha: int):
+        from pygame._sdl2.video import Renderer, Texture, Window
+        self.size = size
+        self.window = Window(title, size=size)
+        # accelerated=-1: SDL prefers a hardware driver but falls back to its software renderer
+        self.renderer = Renderer(self.window, accelerated=-1, target_texture=True)
+        self.renderer.draw_blend_mode = SDL_BLENDMODE_BLEND
+        self.canvas = Texture(self.renderer, size, target=True)
+        self.fade_rgba = (0, 0, 0, max(0, min(255, trail_alpha)))
+
+        cells = [[render_digit(font, ch, level) for level in range(GLYPH_LEVELS)] for ch in "0123456789"]
+        cell_w = max(c.get_width() for row in cells for c in row)
+        cell_h = max(c.get_height() for row in cells for c in row)
+        atlas = pygame.Surface((cell_w * GLYPH_LEVELS, cell_h * len(cells)), pygame.SRCALPHA)
+        self.glyph_rects: list[list[pygame.Rect]] = []
+        for digit, row in enumerate(cells):
+            rects = []
+            for level, cell in enumerate(row):
+                x, y = level * cell_w, digit * cell_h
+                atlas.blit(cell, (x, y), special_flags=pygame.BLEND_RGBA_ADD)  # exact copy onto zeros
+                rects.append(pygame.Rect(x, y, cell.get_width(), cell.get_height()))
+            self.glyph_rects.append(rects)
+        self.atlas = Texture.from_surface(self.renderer, atlas)
+        self.atlas.blend_mode = SDL_BLENDMODE_BLEND
+
+        self.renderer.target = self.canvas
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+
+    def present(self, blit_seq: list):
+        # Fade, draw every (atlas rect, position) pair, then show the canvas
+        renderer = self.renderer
+        renderer.target = self.canvas
+        renderer.draw_color = self.fade_rgba
+        renderer.fill_rect((0, 0, *self.size))
+        for rect, (x_px, y_px) in blit_seq:
+            self.atlas.draw(srcrect=rect, dstrect=(x_px, y_px, rect.w, rect.h))
+        renderer.target = None
+        self.canvas.draw()
+        renderer.present()
+
+def brightness(y_px: int, height_px: int) -> float:
+    # Brightness grows with y; max near bottom for a neon look
+    t = max(0.0, min(1.0, y_px / height_px))
+    return 0.35 + 0.65 * (t ** 1.2)  # [web:70]
+
+def build_level_lut(row_px: int, height_px: int) -> list[int]:
+    # Glyph level for every screen row, so draw does a table lookup instead of pow() per digit
+    top_level = GLYPH_LEVELS - 1
+    return [int(brightness(row * row_px, height_px) * top_level)
+            for row in range(height_px // row_px + 1)]
+
+def build_row_glyphs(glyph_cache: list[list], level_lut: list[int]) -> list[list]:
+    # row_glyphs[row][digit]: the finished glyph for a digit on that screen row; rows that share
+    # a level share one list, so this is just GLYPH_LEVELS small lists plus a row index
+    by_level = [[levels[level] for levels in glyph_cache] for level in range(GLYPH_LEVELS)]
+    return [by_level[level] for level in level_lut]
+
+def fade_settle_frames(keep: int) -> int:
+    # Frames until a full-bright pixel is black under the per-frame fade: BLEND_RGB_MULT by keep
+    # (pygame rounds as (d * s + 255) >> 8, which alone would stall dim pixels short of 0),
+    # then BLEND_RGB_SUB of 1 so the tail still reaches 0. keep == 255 means no fade at all.
+    if keep >= 255:
+        return 0
+    v, frames = 255, 0
+    while v:
+        v, frames = max(0, ((v * keep + 255) >> 8) - 1), frames + 1
+    return frames
 
 # ---------- Column allocator with cooldown (avoid spawning same lane repeatedly) ----------
 class ColumnAllocator:
+    """
+    - Columns past their cooldown sit in `ready` (picked uniformly at random, O(1) swap-remove).
+    - Columns still cooling down sit in a min-heap of (last_used_ms, col), so expiry checks
+      and the least-recently-used fallback only look at the heap top.
+    """
+    __slots__ = ("cols_fit", "cooldown_ms", "ready", "ready_pos", "cooling")
+
     def __init__(self, cols_fit: int, cooldown_ms: int):
         self.cols_fit = max(1, cols_fit)
         self.cooldown_ms = max(0, cooldown_ms)
-        self.last_used = [-10_000_000] * self.cols_fit
+        self.ready = list(range(self.cols_fit))
+        self.ready_pos = list(range(self.cols_fit))    # index into ready, or -1 while cooling
+        self.cooling: list[tuple[int, int]] = []
+
+    def _take_ready(self, idx: int) -> int:
+        col = self.ready[idx]
+        last = self.ready.pop()
+        if last != col:
+            self.ready[idx] = last
+            self.ready_pos[last] = idx
+        self.ready_pos[col] = -1
+        return col
 
     def pick(self, now_ms: int, avoid: int | None = None) -> int:
-        choices = []
-        for c in range(self.cols_fit):
-            if avoid is not None and c == avoid:
-                continue
-            if now_ms - self.last_used[c] >= self.cooldown_ms:
-                choices.append(c)
-        if choices:
-            col = random.choice(choices)
+        # Release columns whose cooldown has expired
+        while self.cooling and now_ms - self.cooling[0][0] >= self.cooldown_ms:
+            col = heapq.heappop(self.cooling)[1]
+            self.ready_pos[col] = len(self.ready)
+            self.ready.append(col)
+
+        n = len(self.ready)
+        if avoid is not None and 0 <= avoid < self.cols_fit and self.ready_pos[avoid] >= 0:
+            # Park the avoided column in the last slot and choose among the others
+            n -= 1
+            other = self.ready[n]
+            idx = self.ready_pos[avoid]
+            self.ready[idx], self.ready[n] = other, avoid
+            self.ready_pos[other], self.ready_pos[avoid] = idx, n
+        if n > 0:
+            col = self._take_ready(random.randrange(n))
+        elif self.ready:
+            # fallback to least-recently-used: a ready column has waited longer than any cooling one
+            col = self._take_ready(0)
         else:
-            # fallback to least-recently-used
-            col = max(range(self.cols_fit), key=lambda c: now_ms - self.last_used[c])
-        self.last_used[col] = now_ms
+            col = heapq.heappop(self.cooling)[1]
+        heapq.heappush(self.cooling, (now_ms, col))
         return col  # [web:60]
 
+# Stream positions are integers in 1/65536 row units, so per-frame motion is a plain int add
+ROW_FRAC_BITS = 16
+ROW_ONE = 1 << ROW_FRAC_BITS
+
 # ---------- One “thread” (digits of a single integer) ----------
 class ThreadStream:
     """
     - Starts at top row (y=0) in a fixed column; emits one digit per row step down that column.
     - After trigger_emits digits, requests spawning the next Collatz value in a new random column.
-    - Oldest digits are culled when they scroll above the top, so disappearance mirrors appearance.
+    - Digits never move up, so the buffer is just capped at a screen's worth of rows; if a stack
+      is ever taller, appendleft drops the oldest (top) digit in O(1).
+    - Once fully emitted the stack falls; digits are culled as they pass the bottom.
     """
-    def __init__(self, value: int, column: int, cols_fit: int, row_px: int, screen_h: int,
-                 rows_per_sec: float, digit_gap_rows: int, trigger_emits: int, log_starts: bool):
+    # Fixed attribute layout: no per-instance __dict__, attribute access by slot offset
+    __slots__ = ("value", "chain", "digits", "digit_count", "column", "row_px", "screen_h",
+                 "digit_gap_rows", "trigger_emits", "log_starts", "head_row_q", "row_accum_q",
+                 "rows_until_next_digit", "emit_index", "emitted_total", "done_emitting",
+                 "spawned_next", "char_buffer")
+
+    # Typed attributes so the class compiles to native fields under mypyc
+    value: BigInt
+    chain: CollatzChain | HistoryCursor
+    digits: bytes
+    digit_count: int
+    column: int
+    row_px: int
+    screen_h: int
+    digit_gap_rows: int
+    trigger_emits: int
+    log_starts: bool
+    head_row_q: int
+    row_accum_q: int
+    rows_until_next_digit: int
+    emit_index: int
+    emitted_total: int
+    done_emitting: bool
+    spawned_next: bool
+    char_buffer: deque[int]
+
+    def __init__(self, value: BigInt, digits: bytes, chain: CollatzChain | HistoryCursor, column: int,
+                 cols_fit: int, row_px: int, screen_h: int, digit_gap_rows: int, trigger_emits: int,
+                 log_starts: bool):
         self.value = value
-        self.digits = list(str(value))          # render-only
+        self.chain = chain                      # lineage this value belongs to
+        self.digits = digits                    # stream_digits(value): render-only, 0..9 per byte
+        self.digit_count = len(self.digits)
         self.column = max(0, min(column, cols_fit - 1))
         self.row_px = row_px
         self.screen_h = screen_h
-        self.rows_per_sec = rows_per_sec
         self.digit_gap_rows = max(0, digit_gap_rows)
         self.trigger_emits = max(1, trigger_emits)
         self.log_starts = log_starts
 
         # Emission state (start exactly at top)
-        self.head_row = 0.0                     # top row
-        self.row_accum = 1.0                    # emit immediately on first update
+        self.head_row_q = 0                     # top row (fixed point, ROW_ONE per row)
+        self.row_accum_q = ROW_ONE              # emit immediately on first update
         self.rows_until_next_digit = 0
         self.emit_index = 0
         self.emitted_total = 0
@@ -59,23 +462,23 @@ class ThreadStream:
         self.spawned_next = False
 
         # Visible stack: newest at index 0 (head)
-        self.char_buffer: list[str] = []
+        self.char_buffer = deque(maxlen=screen_h // max(1, row_px) + 2)
 
         if self.log_starts:
             print(f"start: {self.value}", flush=True)
 
-    def update(self, dt: float):
-        # Move head and accumulate row progress
-        delta_rows = self.rows_per_sec * dt
-        self.head_row += delta_rows
-        self.row_accum += delta_rows
+    def update(self, delta_q: int) -> bool:
+        # Returns True once the stream is offscreen, so the caller knows a cull is needed
+        # Move head and accumulate row progress (delta_q is shared by all streams this frame)
+        self.head_row_q += delta_q
+        self.row_accum_q += delta_q
 
         # Emit one digit for each whole row advanced
-        while self.row_accum >= 1.0 and not self.done_emitting:
-            self.row_accum -= 1.0
+        while self.row_accum_q >= ROW_ONE and not self.done_emitting:
+            self.row_accum_q -= ROW_ONE
             if self.rows_until_next_digit <= 0:
-                if self.emit_index < len(self.digits):
-                    self.char_buffer.insert(0, self.digits[self.emit_index])
+                if self.emit_index < self.digit_count:
+                    self.char_buffer.appendleft(self.digits[self.emit_index])
                     self.emit_index += 1
                     self.emitted_total += 1
                     self.rows_until_next_digit = 1 + self.digit_gap_rows
@@ -84,14 +487,16 @@ class ThreadStream:
             else:
                 self.rows_until_next_digit -= 1
 
-        # Top culling: remove oldest digits once they scroll above the top
-        while self.char_buffer:
-            tail_idx = len(self.char_buffer) - 1
-            tail_y_px = int(self.head_row * self.row_px) - tail_idx * self.row_px
-            if tail_y_px < -self.row_px:
-                self.char_buffer.pop()
-            else:
-                break  # [web:70]
+        # Bottom culling: once emission is done the stack keeps falling, newest digit first.
+        # Dropping the head digit and stepping the head back a row keeps the rest in place.
+        if self.done_emitting:
+            head_y = (self.head_row_q * self.row_px) >> ROW_FRAC_BITS
+            while self.char_buffer and head_y > self.screen_h:
+                self.char_buffer.popleft()
+                self.head_row_q -= ROW_ONE
+                head_y -= self.row_px
+            return not self.char_buffer
+        return False
 
     def wants_next_spawn(self) -> bool:
         # Ask to spawn the next Collatz value after exactly N emitted digits
@@ -104,37 +509,50 @@ class ThreadStream:
         # Stream ends only when all digits have been emitted and buffer is empty
         return self.done_emitting and not self.char_buffer  # [web:60]
 
-    def draw(self, surface: pygame.Surface, font: pygame.font.Font,
-             head_rgb=(220, 255, 220), base_green=(0, 255, 65), height_px: int = 1080):
-        # Brightness grows with y; max near bottom for a neon look
-        def brightness(y_px: int) -> float:
-            t = max(0.0, min(1.0, y_px / height_px))
-            return 0.35 + 0.65 * (t ** 1.2)  # [web:70]
-
-        head_y = int(self.head_row * self.row_px)
-        x_px = self.column * self.row_px
-
-        for i, ch in enumerate(self.char_buffer):
-            y_px = head_y - i * self.row_px
-            if y_px < -self.row_px or y_px > self.screen_h:
-                continue
-            m = brightness(y_px)
-            r = int(head_rgb[0] * m * 0.8)
-            g = int(base_green[1] * m)
-            b = int(base_green[2] * m * 0.5)
-            a = int(255 * m)
-            glyph = font.render(ch, True, (r, g, b))  # antialiased digits for clarity
-            glyph.set_alpha(a)
-            surface.blit(glyph, (x_px, y_px))  # standard alpha over faded background [web:78][web:70]
+    def append_blits(self, blit_seq: list, row_glyphs: list[list]):
+        # row_glyphs[row][digit] holds surfaces (or atlas rects on the GPU path) already at
+        # that row's brightness (see build_row_glyphs)
+        head_y = (self.head_row_q * self.row_px) >> ROW_FRAC_BITS
+        row_px = self.row_px
+        x_px = self.column * row_px
+
+        # Digit i sits at head_y - i*row_px and is visible for -row_px <= y <= screen_h, so only
+        # indices in [i_min, i_max) are walked; their rows come from a range instead of a multiply
+        i_min = max(0, -((self.screen_h - head_y) // row_px))
+        i_max = min(len(self.char_buffer), (head_y + row_px) // row_px + 1)
+        if i_min >= i_max:
+            return
+        rows_y = range(head_y - i_min * row_px, head_y - i_max * row_px, -row_px)
+        for digit, y_px in zip(islice(self.char_buffer, i_min, i_max), rows_y):
+            glyph = row_glyphs[max(0, y_px // row_px)][digit]
+            blit_seq.append((glyph, (x_px, y_px)))  # standard alpha over faded background [web:78][web:70]
+
+# ---------- Seed values for new lineages ----------
+def make_seed_source(start: str | None, min_digits: int, max_digits: int):
+    # Zero-argument seed generator with --start or the digit bounds baked in, so the per-spawn
+    # call has no branch and no 10**k arithmetic
+    if start is not None:
+        fixed = big_int(max(1, int(start, 10)))
+        return lambda: fixed
+    dmin = max(10, min_digits)
+    dmax = max(dmin, max_digits)
+    bounds = [(10 ** (k - 1), 10 ** k) for k in range(dmin, dmax + 1)]
+    choice, randrange = random.choice, random.randrange
+
+    def draw() -> BigInt:
+        lo, hi = choice(bounds)  # digit count k uniform
+        return big_int(randrange(lo, hi))  # [web:9]
+    return draw
 
 # ---------- App orchestrating staggered threads ----------
 class CollatzThreadedRain:
-    def __init__(self, args):
+    def __init__(self, args: argparse.Namespace) -> None:
         self.args = args
         pygame.init()
-        pygame.display.set_caption("Collatz Threaded Rain — staggered 5-digit spawns")
-        self.screen = pygame.display.set_mode((args.width, args.height), pygame.SRCALPHA)
         self.clock = pygame.time.Clock()  # delta-time pacing [web:60]
+        # Only queue the events run() acts on; mouse motion and the rest never become Event objects
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.VIDEOEXPOSE])
 
         # Monospace font, no shadow
         try:
@@ -142,92 +560,172 @@ class CollatzThreadedRain:
         except Exception:
             self.font = pygame.font.SysFont(None, args.font_size)  # [web:78]
 
+        title = "Collatz Threaded Rain — staggered 5-digit spawns"
+        self.screen: pygame.Surface | None = None
+        self.gpu: GpuCanvas | None = None
+        if args.gpu:
+            self.gpu = GpuCanvas((args.width, args.height), title, self.font, args.trail_alpha)
+            self.glyph_cache: list[list] = self.gpu.glyph_rects
+        else:
+            pygame.display.set_caption(title)
+            # Opaque display: glyph blits take SDL's fast path (the fade is a MULT fill, no alpha needed)
+            screen = pygame.display.set_mode((args.width, args.height), pygame.DOUBLEBUF)
+            self.screen = screen
+            self.glyph_cache = build_glyph_cache(self.font, solid=args.fast_text)
+            # pygame-ce's fblits takes the batch without building per-blit results; plain pygame
+            # gets the same single call through blits(doreturn=False)
+            fblits = getattr(screen, "fblits", None)
+            self.blit_all = fblits if fblits is not None else (
+                lambda seq: screen.blits(seq, doreturn=False))
+
         self.row_px = args.font_size
+        # Integer motion by measured time: speed_q * dt_ms is in 1/1000 fixed-point rows, and the
+        # part below one unit carries to the next frame, so no frame length drifts the speed
+        self.speed_q = int(args.speed * ROW_ONE)    # rows/s in fixed point
+        self.motion_rem = 0
         self.cols_fit = max(1, args.width // self.row_px)
-
-        # Trail fade (global) for smooth tails
-        self.fade_surface = pygame.Surface((args.width, args.height), pygame.SRCALPHA)
-        self.fade_surface.fill((0, 0, 0, max(0, min(255, args.trail_alpha))))  # [web:70]
-
+        self.row_glyphs = build_row_glyphs(self.glyph_cache, build_level_lut(self.row_px, args.height))
+
+        # Trail fade (global) for smooth tails: scale every pixel by (255 - alpha) / 255 like
+        # blending black at that alpha, then subtract 1 so MULT's round-up can't leave a grey floor
+        keep = 255 - max(0, min(255, args.trail_alpha))
+        self.fade_rgb = (keep, keep, keep)  # [web:70]
+        self.fade_floor = keep < 255
+
+        # Dirty strips: a column strip is faded and pushed to the window while it shows glyphs
+        # and until its faded trail has settled; everything else is unchanged on screen
+        self.settle_frames = fade_settle_frames(keep)
+        self.strip_rects = [pygame.Rect(c * self.row_px, 0, self.row_px, args.height)
+                            for c in range(self.cols_fit)]
+        self.strip_live_until = [0] * self.cols_fit
+        self.frame_index = 0
+        self.full_redraw = True
+
+        self.step = STEP_RULES[args.step_rule]
+        # Background producer: Collatz batches (possibly bigint-heavy) stay off the render loop
+        self.refill_q: queue.Queue[CollatzChain | CollatzHistory] = queue.Queue()
+        threading.Thread(target=self._produce_batches, daemon=True).start()
         self.alloc = ColumnAllocator(self.cols_fit, args.column_cooldown_ms)
         self.streams: list[ThreadStream] = []
 
+        self._seed_value = make_seed_source(args.start, args.min_digits, args.max_digits)
+        # With --start every seed thread replays the same trajectory, so compute it once
+        self.start_history = (CollatzHistory(self._seed_value(), self.step, refill_q=self.refill_q)
+                              if args.start is not None else None)
+
         # Seed exactly one thread to start the chain cleanly (not spamming every column)
         col0 = self.alloc.pick(pygame.time.get_ticks())
-        self.streams.append(self._new_thread(self._seed_value(), col0))  # [web:60]
+        self.streams.append(self._new_seed_thread(col0))  # [web:60]
 
         # Optional minimal background fill: keep at least min_concurrent threads active
         self.min_concurrent = max(1, args.min_concurrent)
 
-    def _seed_value(self) -> int:
-        if self.args.start is not None:
-            return max(1, int(self.args.start, 10))
-        dmin = max(10, self.args.min_digits)
-        dmax = max(dmin, self.args.max_digits)
-        k = random.randint(dmin, dmax)
-        lo, hi = 10 ** (k - 1), 10 ** k - 1
-        return random.randrange(lo, hi + 1)  # [web:9]
+    def _produce_batches(self):
+        while True:
+            self.refill_q.get().extend()
 
-    def _new_thread(self, value: int, column: int) -> ThreadStream:
+    def _new_thread(self, value: BigInt, digits: bytes, chain: CollatzChain | HistoryCursor,
+                    column: int) -> ThreadStream:
         return ThreadStream(
             value=value,
+            digits=digits,
+            chain=chain,
             column=column,
             cols_fit=self.cols_fit,
             row_px=self.row_px,
             screen_h=self.args.height,
-            rows_per_sec=self.args.speed,
             digit_gap_rows=self.args.digit_gap_rows,
             trigger_emits=self.args.spawn_after_digits,
             log_starts=self.args.log_starts,
         )  # [web:60]
 
+    def _new_seed_thread(self, column: int) -> ThreadStream:
+        if self.start_history is not None:
+            value, digits = self.start_history.values[0]
+            return self._new_thread(value, digits, HistoryCursor(self.start_history), column)
+        value = self._seed_value()
+        chain = CollatzChain(value, self.step, refill_q=self.refill_q)
+        return self._new_thread(value, stream_digits(value), chain, column)
+
     def _spawn_next_from(self, parent: ThreadStream):
-        nxt = collatz_step(parent.value)
+        nxt, digits = parent.chain.next_value()
         now_ms = pygame.time.get_ticks()
         col = self.alloc.pick(now_ms, avoid=parent.column)
-        self.streams.append(self._new_thread(nxt, col))
+        self.streams.append(self._new_thread(nxt, digits, parent.chain, col))
         parent.mark_spawned()  # [web:9][web:60]
 
     def _top_up_min_concurrent(self):
         # Keep a gentle baseline so the screen never goes empty, but avoid spam
         while len(self.streams) < self.min_concurrent:
             col = self.alloc.pick(pygame.time.get_ticks())
-            self.streams.append(self._new_thread(self._seed_value(), col))  # [web:60]
+            self.streams.append(self._new_seed_thread(col))  # [web:60]
 
-    def run(self):
+    def run(self) -> None:
         running = True
         while running:
-            dt = self.clock.tick(self.args.fps) / 1000.0  # consistent motion [web:60]
+            dt_ms = self.clock.tick(self.args.fps)  # consistent motion [web:60]
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self.full_redraw = True  # window contents lost: push everything next frame
 
-            # Fade trails
-            self.screen.blit(self.fade_surface, (0, 0))  # [web:70]
-
-            # Update all threads
-            for s in list(self.streams):
-                s.update(dt)
+            # Update all threads; head motion is the same for every stream, so compute it once
+            delta_q, self.motion_rem = divmod(self.speed_q * dt_ms + self.motion_rem, 1000)
+            finished = 0
+            parents = []
+            for s in self.streams:
+                if s.update(delta_q):
+                    finished += 1
                 # spawn next Collatz thread exactly after N emitted digits
                 if s.wants_next_spawn():
-                    self._spawn_next_from(s)
-
-            # Remove finished threads (after their digits scrolled off the top)
-            self.streams = [s for s in self.streams if not s.offscreen()]  # [web:60]
+                    parents.append(s)
+            # Children join after the walk (as before, they start moving next frame)
+            for parent in parents:
+                self._spawn_next_from(parent)
+
+            # Remove finished threads in place (after their digits left the screen);
+            # most frames nobody finished, so skip the pass entirely
+            if finished:
+                write = 0
+                for s in self.streams:
+                    if not s.offscreen():
+                        self.streams[write] = s
+                        write += 1
+                del self.streams[write:]  # [web:60]
 
             # Maintain minimal concurrency (no blank screen), but not dense spam
             self._top_up_min_concurrent()  # [web:60]
 
-            # Draw
+            # Draw: gather every visible glyph, then hand them to SDL in one call
+            self.frame_index += 1
+            blit_seq: list = []
             for s in self.streams:
-                s.draw(self.screen, self.font, height_px=self.args.height)  # [web:70][web:78]
-
-            pygame.display.flip()
+                s.append_blits(blit_seq, self.row_glyphs)  # [web:70][web:78]
+                if s.char_buffer:
+                    self.strip_live_until[s.column] = self.frame_index + self.settle_frames
+
+            if self.gpu is not None:
+                self.gpu.present(blit_seq)
+            elif self.screen is not None:
+                # Fade trails on live strips only (settled strips would not change), then draw on top
+                live = [rect for rect, until in zip(self.strip_rects, self.strip_live_until)
+                        if until >= self.frame_index]
+                for rect in live:
+                    self.screen.fill(self.fade_rgb, rect, special_flags=pygame.BLEND_RGB_MULT)  # [web:70]
+                    if self.fade_floor:
+                        self.screen.fill((1, 1, 1), rect, special_flags=pygame.BLEND_RGB_SUB)
+                self.blit_all(blit_seq)
+                if self.full_redraw:
+                    pygame.display.flip()
+                    self.full_redraw = False
+                else:
+                    pygame.display.update(live)
 
         pygame.quit()
 
 def main():
-    parser = argparse.ArgumentParser(description="Collatz threaded rain — spawn after 5 digits, top-cull")
+    parser = argparse.ArgumentParser(description="Collatz threaded rain — spawn after 5 digits, bottom-cull")
     parser.add_argument("--width", type=int, default=1280)
     parser.add_argument("--height", type=int, default=720)
     parser.add_argument("--font-size", type=int, default=18)
@@ -241,10 +739,22 @@ def main():
     parser.add_argument("--min-digits", type=int, default=10)
     parser.add_argument("--max-digits", type=int, default=26)
     parser.add_argument("--start", type=str, default=None, help="Optional fixed starting integer (>=10 digits)")
+    parser.add_argument("--step-rule", choices=sorted(STEP_RULES), default="classic",
+                        help="classic = one Collatz step per thread; shortcut = (3n+1)/2 for odd n; "
+                             "plateau = collapse runs of halvings; "
+                             "odd = jump straight to the next odd value")
+    parser.add_argument("--gpu", action="store_true",
+                        help="Draw through the SDL2 renderer (hardware when available) from a glyph atlas texture")
+    parser.add_argument("--fast-text", action="store_true",
+                        help="Solid (non-antialiased) colorkeyed glyphs for cheaper software blits")
     parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("--log-starts", action="store_true")
     args = parser.parse_args()
 
+    # Display-only conversions of long orbits shouldn't trip CPython's int->str safety cap
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+
     if args.seed is not None:
         random.seed(args.seed)
 
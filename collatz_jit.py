@@ -0,0 +1,21 @@
+# Numba kernel for collatz.py, kept in its own module: a mypyc build of collatz.py turns every
+# function in it into native code, which njit cannot compile (it needs the Python bytecode)
+
+import numpy as np  # type: ignore[import-not-found]
+from numba import njit  # type: ignore[import-not-found]
+
+@njit(cache=True)
+def collatz_u64(n, limit, out):
+    # Native classic steps into a preallocated buffer; stops before 3n+1 could overflow
+    one, three = np.uint64(1), np.uint64(3)
+    i = 0
+    while i < out.shape[0]:
+        if n & one:
+            if n > limit:
+                break
+            n = three * n + one
+        else:
+            n = n >> one
+        out[i] = n
+        i += 1
+    return i